@@ -6,6 +6,10 @@ class StatusCodeError(Exception):
     """Ошибка ответа сервера."""
 
 
+class JsonFormatError(Exception):
+    """Ответ сервера не в формате json."""
+
+
 class DictionaryError(Exception):
     """Ошибка полученного словаря."""
 
@@ -14,9 +18,5 @@ class UnknownStatusError(Exception):
     """Неизвестный статус работы."""
 
 
-class TokenSystemError(Exception):
-    """Отсутствует токен в системе."""
-
-
 class EnvironmentVariableError(Exception):
     """Отсутствует переменная окружения."""
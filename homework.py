@@ -1,8 +1,10 @@
+import atexit
 from http import HTTPStatus
-import json
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import random
 import time
 
 from dotenv import load_dotenv
@@ -18,6 +20,10 @@ TELEGRAM_TOKEN = os.getenv('BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('MY_ID')
 
 RETRY_TIME = 600
+RETRY_BASE_TIME = 5
+RETRY_JITTER = 5
+REQUEST_TIMEOUT = (5, 30)
+TELEGRAM_MESSAGE_LIMIT = 4096
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 HOMEWORK_STATUSES = {
@@ -25,28 +31,29 @@ HOMEWORK_STATUSES = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    filename='program.log',
-    format='%(asctime)s, [%(levelname)s], %(message)s',
-)
+VERDICT_TEMPLATE = 'Изменился статус проверки работы "{}". {}'
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
+logger.propagate = False
 handler = RotatingFileHandler(
     'my_logger.log',
     encoding='UTF-8',
     maxBytes=50000000,
     backupCount=5,
 )
-logger.addHandler(handler)
 
 formatter = logging.Formatter(
     '%(asctime)s, [%(levelname)s], %(message)s'
 )
 handler.setFormatter(formatter)
 
+log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(log_queue))
+listener = QueueListener(log_queue, handler)
+listener.start()
+atexit.register(listener.stop)
+
 
 def send_message(bot, message):
     """Отправляет сообщение в Telegram чат."""
@@ -56,10 +63,10 @@ def send_message(bot, message):
             text=message,
         )
         logger.info(
-            'Отправлено сообщение в чат {TELEGRAM_CHAT_ID}: {message}'
+            'Отправлено сообщение в чат %s: %s', TELEGRAM_CHAT_ID, message
         )
     except telegram.TelegramError as telegram_error:
-        logger.error(f'Ошибка отправки сообщения {telegram_error}')
+        logger.error('Ошибка отправки сообщения %s', telegram_error)
 
 
 def get_api_answer(current_timestamp):
@@ -72,6 +79,7 @@ def get_api_answer(current_timestamp):
             ENDPOINT,
             headers=HEADERS,
             params=params,
+            timeout=REQUEST_TIMEOUT,
         )
     except requests.exceptions.RequestException as requests_error:
         api_answer_error = f'Ошибка при запросе к API: {requests_error}'
@@ -86,10 +94,10 @@ def get_api_answer(current_timestamp):
 
     try:
         return homework_response.json()
-    except json.JSONDecodeError as json_error:
+    except ValueError as json_error:
         api_answer_error = f'Ошибка ответа формата json {json_error}'
         logger.error(api_answer_error)
-        raise json.JSONDecodeError(api_answer_error)
+        raise exceptions.JsonFormatError(api_answer_error)
 
 
 def check_response(response):
@@ -99,23 +107,20 @@ def check_response(response):
         logger.error(response_error)
         raise exceptions.DictionaryError(response_error)
 
-    if type(response) is not dict:
+    if not isinstance(response, dict):
         logger.error('Ответ не является словарем')
         raise TypeError('Ответ не является словарем')
 
     if 'homeworks' not in response:
         logger.error('Отсутствует ключ homeworks в словаре')
         raise KeyError('Отсутствует ключ homeworks в словаре')
+    homeworks = response['homeworks']
 
-    if type(response['homeworks']) is not list:
+    if not isinstance(homeworks, list):
         logger.error('Домашняя работа не является списком')
         raise TypeError('Домашняя работа не является списком')
 
-    if not response['homeworks']:
-        logger.info('Список домашних работ пуст')
-        raise KeyError('Список домашних работ пуст')
-
-    return response['homeworks']
+    return homeworks
 
 
 def parse_status(homework):
@@ -123,33 +128,50 @@ def parse_status(homework):
 
     статус этой работы.
     """
-    if 'homework_name' not in homework:
+    homework_name = homework.get('homework_name')
+    if homework_name is None:
         raise KeyError('Отсутствует ключ "homework_name" в ответе API')
-    homework_name = homework['homework_name']
 
-    if 'status' not in homework:
+    homework_status = homework.get('status')
+    if homework_status is None:
         raise KeyError('Отсутствует ключ "status" в ответе API')
-    homework_status = homework['status']
 
-    if homework_status not in HOMEWORK_STATUSES:
+    verdict = HOMEWORK_STATUSES.get(homework_status)
+    if verdict is None:
         error = f'Неизвестный статус работы: {homework_status}'
         raise exceptions.UnknownStatusError(error)
 
-    verdict = HOMEWORK_STATUSES[homework_status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return VERDICT_TEMPLATE.format(homework_name, verdict)
 
 
-def check_os_keys():
-    """Проверка токенов в системе."""
-    keys = [
-        'YANDEX_TOKEN',
-        'BOT_TOKEN',
-        'MY_ID',
-    ]
+def get_status_messages(homeworks):
+    """Готовит сообщения о статусах всех работ из ответа API.
 
-    for key in keys:
-        if key in os.environ:
-            return True
+    Работа с некорректными данными не мешает обработке остальных.
+    """
+    messages = []
+    for homework in homeworks:
+        try:
+            messages.append(parse_status(homework))
+        except (KeyError, exceptions.UnknownStatusError) as error:
+            logger.error(error)
+            messages.append(f'Сбой в работе программы: {error}')
+    return messages
+
+
+def join_messages(messages):
+    """Объединяет сообщения в тексты не длиннее лимита Telegram."""
+    texts = []
+    text = ''
+    for message in messages:
+        message = message[:TELEGRAM_MESSAGE_LIMIT]
+        if text and len(text) + len(message) + 1 > TELEGRAM_MESSAGE_LIMIT:
+            texts.append(text)
+            text = ''
+        text = f'{text}\n{message}' if text else message
+    if text:
+        texts.append(text)
+    return texts
 
 
 def check_tokens():
@@ -157,47 +179,58 @@ def check_tokens():
     return all((PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID))
 
 
+def get_retry_time(attempt):
+    """Вычисляет паузу перед повторным запросом после сбоя."""
+    return (
+        min(RETRY_TIME, RETRY_BASE_TIME * 2 ** attempt)
+        + random.uniform(0, RETRY_JITTER)
+    )
+
+
 def main():
     """Основная логика работы бота."""
-    if not check_os_keys():
-        token_error = 'Отсутствует токен в системе'
-        logging.critical(token_error)
-        raise exceptions.TokenSystemError(token_error)
-
     if not check_tokens():
         variable_error = 'Отсутствует переменная окружения'
-        logging.critical(variable_error)
+        logger.critical(variable_error)
         raise exceptions.EnvironmentVariableError(variable_error)
 
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     current_timestamp = int(time.time())
-    status = ''
     message_error = ''
+    attempt = 0
     api_message = 'Повторный запрос к API через 10 минут'
     while True:
         try:
             response = get_api_answer(current_timestamp)
-            homework = check_response(response)[0]
-            if homework and status != homework['status']:
-                message = parse_status(homework)
-                send_message(bot, message)
-                status = homework['status']
-                logger.info(f'Есть изменения. <<{status}>>. {api_message}')
-                time.sleep(RETRY_TIME)
+            homeworks = check_response(response)
+            messages = get_status_messages(homeworks)
+            if not messages:
+                logger.info('Список домашних работ пуст. %s', api_message)
             else:
-                logger.info(f'Изменений нет. {api_message}')
-                time.sleep(RETRY_TIME)
+                for text in join_messages(messages):
+                    send_message(bot, text)
+                logger.info('Есть изменения. %s', api_message)
         except Exception as error:
-            if not response['homeworks']:
-                logger.info(f'{error} {api_message}')
-                time.sleep(RETRY_TIME)
-            else:
-                logger.error(error)
-                message = f'Сбой в работе программы: {error}'
-                if message != message_error:
-                    send_message(bot, message)
-                logger.info(f'Сбой программы. {api_message}')
-                time.sleep(RETRY_TIME)
+            logger.error(error)
+            message = f'Сбой в работе программы: {error}'
+            if message != message_error:
+                send_message(bot, message)
+                message_error = message
+            retry_time = get_retry_time(attempt)
+            attempt += 1
+            logger.info(
+                'Сбой программы. Повторный запрос к API '
+                'через %.0f сек.',
+                retry_time,
+            )
+            time.sleep(retry_time)
+        else:
+            current_timestamp = response.get(
+                'current_date', current_timestamp
+            )
+            attempt = 0
+            message_error = ''
+            time.sleep(RETRY_TIME)
 
 
 if __name__ == '__main__':
@@ -73,6 +73,48 @@ class MockTelegramBot:
         return self.random_timestamp
 
 
+class StopLoop(Exception):
+    pass
+
+
+def run_main(monkeypatch, answers, random_timestamp):
+    """Runs main() over the given API answers, stops at the last sleep."""
+    requested = []
+    sent = []
+    sleeps = []
+
+    def mock_telegram_bot(*args, **kwargs):
+        return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
+
+    def mock_get_api_answer(timestamp):
+        requested.append(timestamp)
+        return answers[len(requested) - 1]
+
+    def mock_sleep(seconds):
+        sleeps.append(seconds)
+        if len(requested) == len(answers):
+            raise StopLoop
+
+    import homework
+
+    monkeypatch.setattr(telegram, 'Bot', mock_telegram_bot)
+    monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'sometoken')
+    monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+    monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 12345)
+    monkeypatch.setattr(homework, 'get_api_answer', mock_get_api_answer)
+    monkeypatch.setattr(
+        homework, 'send_message',
+        lambda bot, message: sent.append(message)
+    )
+    monkeypatch.setattr(homework.time, 'sleep', mock_sleep)
+
+    try:
+        homework.main()
+    except StopLoop:
+        pass
+    return requested, sent, sleeps
+
+
 class TestHomework:
     HOMEWORK_STATUSES = {
         'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -640,3 +682,186 @@ class TestHomework:
                 f'Убедитесь, что в функции `{func_name}` обрабатываете ситуацию, '
                 'когда API возвращает код, отличный от 200'
             )
+
+    def test_get_api_answer_timeout(self, monkeypatch, random_timestamp,
+                                    current_timestamp, api_url):
+        calls = []
+
+        def mock_response_get(*args, **kwargs):
+            calls.append(kwargs)
+            return MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+
+        import homework
+
+        func_name = 'get_api_answer'
+        homework.get_api_answer(current_timestamp)
+        assert calls[0].get('timeout') == homework.REQUEST_TIMEOUT, (
+            f'Убедитесь, что функция `{func_name}` ограничивает время '
+            'запроса к API параметром `timeout`'
+        )
+
+    def test_get_api_answer_invalid_json(self, monkeypatch, random_timestamp,
+                                         current_timestamp, api_url):
+        def mock_response_get(*args, **kwargs):
+            response = MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                current_timestamp=current_timestamp, **kwargs
+            )
+
+            def json_invalid():
+                raise ValueError('Expecting value: line 1 column 1 (char 0)')
+
+            response.json = json_invalid
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+
+        import homework
+
+        func_name = 'get_api_answer'
+        try:
+            homework.get_api_answer(current_timestamp)
+        except homework.exceptions.JsonFormatError:
+            pass
+        else:
+            assert False, (
+                f'Убедитесь, что функция `{func_name}` выбрасывает '
+                '`JsonFormatError`, когда ответ API не в формате json'
+            )
+
+    def test_get_retry_time(self):
+        import homework
+
+        func_name = 'get_retry_time'
+        utils.check_function(homework, func_name, 1)
+        first = homework.get_retry_time(0)
+        assert first <= homework.RETRY_BASE_TIME + homework.RETRY_JITTER, (
+            f'Убедитесь, что функция `{func_name}` после первого сбоя '
+            'возвращает короткую паузу'
+        )
+        assert homework.get_retry_time(3) >= homework.RETRY_BASE_TIME * 8, (
+            f'Убедитесь, что пауза в функции `{func_name}` растет '
+            'экспоненциально с каждым сбоем'
+        )
+        longest = homework.get_retry_time(100)
+        assert longest >= homework.RETRY_TIME, (
+            f'Убедитесь, что пауза в функции `{func_name}` доходит '
+            'до значения RETRY_TIME'
+        )
+        assert longest <= homework.RETRY_TIME + homework.RETRY_JITTER, (
+            f'Убедитесь, что функция `{func_name}` ограничивает паузу '
+            'значением RETRY_TIME'
+        )
+
+    def test_check_response_empty_homeworks(self, random_timestamp):
+        import homework
+
+        func_name = 'check_response'
+        homeworks = homework.check_response(
+            {'homeworks': [], 'current_date': random_timestamp}
+        )
+        assert homeworks == [], (
+            f'Убедитесь, что функция `{func_name}` возвращает пустой список, '
+            'когда новых домашних работ нет'
+        )
+
+    def test_main_empty_homeworks(self, monkeypatch, random_timestamp):
+        answers = [{'homeworks': [], 'current_date': random_timestamp}]
+
+        import homework
+
+        _, sent, sleeps = run_main(monkeypatch, answers, random_timestamp)
+        assert not sent, (
+            'Убедитесь, что при пустом списке домашних работ бот '
+            'не отправляет сообщение в Telegram'
+        )
+        assert sleeps == [homework.RETRY_TIME], (
+            'Убедитесь, что при пустом списке домашних работ бот '
+            'ждет RETRY_TIME, а не уходит в повтор после сбоя'
+        )
+
+    def test_main_advances_from_date(self, monkeypatch, random_timestamp):
+        answers = [
+            {
+                'homeworks': [
+                    {'homework_name': 'hw1', 'status': 'reviewing'},
+                    {'homework_name': 'hw2', 'status': 'reviewing'},
+                ],
+                'current_date': random_timestamp,
+            },
+            {'homeworks': [], 'current_date': random_timestamp + 600},
+        ]
+
+        requested, sent, _ = run_main(monkeypatch, answers, random_timestamp)
+        assert requested[1] == random_timestamp, (
+            'Убедитесь, что следующий запрос к API делается '
+            'с `from_date`, равным `current_date` из предыдущего ответа'
+        )
+        assert len(sent) == 1, (
+            'Убедитесь, что бот объединяет изменения за один опрос '
+            'в одно сообщение'
+        )
+        assert 'hw1' in sent[0] and 'hw2' in sent[0], (
+            'Убедитесь, что бот сообщает о каждой '
+            'домашней работе из ответа API'
+        )
+
+    def test_main_unknown_status_does_not_stall(self, monkeypatch,
+                                                random_timestamp):
+        answers = [
+            {
+                'homeworks': [
+                    {'homework_name': 'hw1', 'status': 'new_status'},
+                    {'homework_name': 'hw2', 'status': 'approved'},
+                ],
+                'current_date': random_timestamp,
+            },
+            {'homeworks': [], 'current_date': random_timestamp + 600},
+        ]
+
+        import homework
+
+        requested, sent, sleeps = run_main(
+            monkeypatch, answers, random_timestamp
+        )
+        text = '\n'.join(sent)
+        assert 'Изменился статус проверки работы "hw2"' in text, (
+            'Убедитесь, что работа с неизвестным статусом не мешает '
+            'отправке статусов остальных работ'
+        )
+        assert 'new_status' in text, (
+            'Убедитесь, что бот сообщает о работе с неизвестным статусом'
+        )
+        assert requested[1] == random_timestamp, (
+            'Убедитесь, что работа с неизвестным статусом не мешает '
+            'сдвигать `from_date` на `current_date` из ответа'
+        )
+        assert sleeps[0] == homework.RETRY_TIME, (
+            'Убедитесь, что работа с неизвестным статусом не переводит '
+            'бота в повтор после сбоя'
+        )
+
+    def test_join_messages(self):
+        import homework
+
+        func_name = 'join_messages'
+        utils.check_function(homework, func_name, 1)
+        messages = [str(i) * 1000 for i in range(10)]
+        texts = homework.join_messages(messages)
+        assert all(
+            len(text) <= homework.TELEGRAM_MESSAGE_LIMIT for text in texts
+        ), (
+            f'Убедитесь, что функция `{func_name}` не превышает '
+            'лимит длины сообщения Telegram'
+        )
+        assert '\n'.join(texts).split('\n') == messages, (
+            f'Убедитесь, что функция `{func_name}` не теряет сообщения'
+        )
+        assert len(texts) < len(messages), (
+            f'Убедитесь, что функция `{func_name}` объединяет сообщения'
+        )